@@ -5,11 +5,12 @@ MongoDB helper functions ready to use in your backend code.
 Import and use these functions in your API endpoints for database operations.
 """
 
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import CollectionInvalid
 from datetime import datetime, timezone
 import os
 from dotenv import load_dotenv
-from typing import Union
+from typing import List, Union
 from pydantic import BaseModel
 
 # Load environment variables from .env file
@@ -21,12 +22,70 @@ db = None
 database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
-if database_url and database_name:
-    _client = MongoClient(database_url)
+def connect():
+    """Create the client for this process; called from the app lifespan so a
+    uvicorn supervisor that only imports the app never opens a pool"""
+    global _client, db
+    if _client is not None or not (database_url and database_name):
+        return
+    # Bounded pool kept warm by minPoolSize; callers waiting on a saturated
+    # pool fail fast instead of queueing indefinitely. Sizes are per worker.
+    _client = AsyncIOMotorClient(
+        database_url,
+        maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", 50)),
+        minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", 10)),
+        waitQueueTimeoutMS=2000,
+        serverSelectionTimeoutMS=3000,
+    )
     db = _client[database_name]
 
+def close():
+    global _client, db
+    if _client is not None:
+        _client.close()
+    _client = None
+    db = None
+
+# Indexes backing the lead-scoped list endpoints (filter + descending _id
+# keyset pagination, i.e. newest-first to the second); the unfiltered lead
+# list uses the default _id index
+INDEXES = {
+    "lead": [
+        [("assigned_agent_id", 1), ("_id", -1)],
+        [("assigned_manager_id", 1), ("_id", -1)],
+    ],
+    "followup": [
+        [("lead_id", 1), ("_id", -1)],
+    ],
+    "quotation": [
+        [("lead_id", 1), ("_id", -1)],
+    ],
+}
+
+async def ensure_indexes():
+    """Create the indexes in INDEXES; a no-op for ones that already exist"""
+    if db is None:
+        return
+    for collection_name, keys_list in INDEXES.items():
+        for keys in keys_list:
+            await db[collection_name].create_index(keys)
+
+async def ensure_validators(validators: dict):
+    """Install collection validators, creating collections that don't exist yet"""
+    if db is None:
+        return
+    existing = set(await db.list_collection_names())
+    for collection_name, validator in validators.items():
+        if collection_name not in existing:
+            try:
+                await db.create_collection(collection_name, validator=validator)
+                continue
+            except CollectionInvalid:
+                pass  # created concurrently (e.g. by another worker)
+        await db.command("collMod", collection_name, validator=validator)
+
 # Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
+async def create_document(collection_name: str, data: Union[BaseModel, dict]):
     """Insert a single document with timestamp"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
@@ -40,10 +99,28 @@ def create_document(collection_name: str, data: Union[BaseModel, dict]):
     data_dict['created_at'] = datetime.now(timezone.utc)
     data_dict['updated_at'] = datetime.now(timezone.utc)
 
-    result = db[collection_name].insert_one(data_dict)
+    result = await db[collection_name].insert_one(data_dict)
     return str(result.inserted_id)
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
+async def create_documents(collection_name: str, items: List[Union[BaseModel, dict]]):
+    """Insert many documents with timestamps in a single round-trip"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+    if not items:
+        return []
+
+    now = datetime.now(timezone.utc)
+    docs = []
+    for data in items:
+        data_dict = data.model_dump() if isinstance(data, BaseModel) else data.copy()
+        data_dict['created_at'] = now
+        data_dict['updated_at'] = now
+        docs.append(data_dict)
+
+    result = await db[collection_name].insert_many(docs, ordered=False)
+    return [str(x) for x in result.inserted_ids]
+
+async def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
     """Get documents from collection"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
@@ -52,4 +129,4 @@ def get_documents(collection_name: str, filter_dict: dict = None, limit: int = N
     if limit:
         cursor = cursor.limit(limit)
     
-    return list(cursor)
+    return await cursor.to_list(length=None)
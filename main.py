@@ -1,25 +1,79 @@
+import asyncio
+import logging
 import os
-from typing import Any, Dict, List, Optional
-from fastapi import FastAPI, HTTPException
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type, get_args
+import orjson
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, ValidationError
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, WriteError
 
-from database import db, create_document, get_documents
+import database
+from database import (
+    create_document, create_documents, get_documents,
+    ensure_indexes, ensure_validators,
+)
 from schemas import (
     Community, Tower, Flat, FloorPlan,
-    Lead, FollowUp, QuotationInputs, Quotation,
-    SCHEMA_MANIFEST
+    FollowUp, QuotationInputs,
+    COLLECTION_VALIDATORS, SCHEMA_MANIFEST
 )
 
-app = FastAPI(title="DreamNest API")
+logger = logging.getLogger(__name__)
+
+# Whether MongoDB enforces COLLECTION_VALIDATORS for the admin endpoints;
+# set once the lifespan has installed them
+_admin_validation: Dict[str, bool] = {"server_side": False}
+
+async def _warm_database():
+    # Don't block the API from coming up if Mongo is unreachable; /test
+    # reports the database state
+    if database.db is None:
+        return
+    try:
+        # Open the first pooled connection before traffic arrives
+        await database.db.command("ping")
+        await ensure_indexes()
+    except Exception as e:
+        logger.warning("Database warm-up failed: %s", e)
+        return
+    try:
+        await ensure_validators(COLLECTION_VALIDATORS)
+        _admin_validation["server_side"] = True
+    except Exception as e:
+        logger.error("Could not install collection validators, admin writes "
+                     "fall back to Pydantic validation: %s", e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    database.connect()
+    await _warm_database()
+    yield
+    database.close()
+
+app = FastAPI(title="DreamNest API", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+# Comma-separated list of allowed frontend origins. This is a security
+# setting, not a speed-up: with an explicit list the middleware checks the
+# Origin and sets Access-Control-Allow-Origin/Vary on every response, while
+# the "*" fallback (when unset) only echoes the Origin for cookie requests.
+# Unset keeps any origin and header allowed.
+CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip()]
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS or ["*"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PATCH"],
+    allow_headers=["content-type", "authorization"] if CORS_ORIGINS else ["*"],
 )
 
 # ---------------------- Utilities ----------------------
@@ -32,35 +86,71 @@ class PyObjectId(ObjectId):
     def validate(cls, v):
         if isinstance(v, ObjectId):
             return v
-        if not ObjectId.is_valid(v):
+        if v is None:
+            raise ValueError("Invalid ObjectId")
+        try:
+            return ObjectId(v)
+        except (InvalidId, TypeError):
             raise ValueError("Invalid ObjectId")
-        return ObjectId(v)
+
+def _to_oid(value: str, kind: str) -> ObjectId:
+    """Parse a path/body id once, raising 400 instead of validating then re-parsing"""
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        raise HTTPException(status_code=400, detail=f"Invalid {kind} id")
 
 def to_serializable(doc: Dict[str, Any]):
+    # Converts in place: callers pass documents fresh off a cursor
     if not doc:
         return doc
-    doc = dict(doc)
-    if "_id" in doc:
-        doc["id"] = str(doc.pop("_id"))
-    # Convert nested ObjectIds
-    for k, v in list(doc.items()):
+    _id = doc.pop("_id", None)
+    # Convert nested ObjectIds; rebinding existing keys is safe mid-iteration
+    for k, v in doc.items():
         if isinstance(v, ObjectId):
             doc[k] = str(v)
-        if isinstance(v, list):
+        elif isinstance(v, list) and any(isinstance(x, ObjectId) for x in v):
             doc[k] = [str(x) if isinstance(x, ObjectId) else x for x in v]
+    if _id is not None:
+        doc["id"] = str(_id)
     return doc
 
+# Tail of the list pipelines: Mongo renders _id as a string "id" so results
+# need no to_serializable pass
+_STRINGIFY_ID = [
+    {"$addFields": {"id": {"$toString": "$_id"}}},
+    {"$project": {"_id": 0}},
+]
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+def _page_pipeline(filt: Dict[str, Any], limit: int, before: Optional[str]) -> List[Dict[str, Any]]:
+    """Keyset page of documents with _id below `before`, in descending _id.
+
+    ObjectIds lead with whole seconds, followed by per-process random bytes,
+    so this is newest-first only to the second: documents written in the
+    same second by different workers sort by process, not by time. Pages
+    never skip or repeat documents.
+    """
+    if before:
+        filt = {**filt, "_id": {"$lt": _to_oid(before, "cursor")}}
+    return [{"$match": filt}, {"$sort": {"_id": -1}}, {"$limit": limit}, *_STRINGIFY_ID]
+
 # ---------------------- Health ----------------------
 @app.get("/")
-def root():
+async def root():
     return {"message": "DreamNest API running"}
 
+# SCHEMA_MANIFEST is static, encode it once
+_SCHEMA_BYTES = orjson.dumps(SCHEMA_MANIFEST.model_dump())
+
 @app.get("/schema")
-def schema():
-    return SCHEMA_MANIFEST.model_dump()
+async def schema():
+    return Response(content=_SCHEMA_BYTES, media_type="application/json")
 
 @app.get("/test")
-def test_database():
+async def test_database():
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
@@ -70,13 +160,13 @@ def test_database():
         "collections": []
     }
     try:
-        if db is not None:
+        if database.db is not None:
             response["database"] = "✅ Available"
             response["database_url"] = "✅ Set" if os.getenv("DATABASE_URL") else "❌ Not Set"
-            response["database_name"] = db.name
+            response["database_name"] = database.db.name
             response["connection_status"] = "Connected"
             try:
-                collections = db.list_collection_names()
+                collections = await database.db.list_collection_names()
                 response["collections"] = collections[:10]
                 response["database"] = "✅ Connected & Working"
             except Exception as e:
@@ -88,41 +178,156 @@ def test_database():
     return response
 
 # ---------------------- Catalog ----------------------
+# The catalog is read-mostly: keep the encoded response body per process and
+# drop it whenever an admin endpoint writes to one of its collections.
+CATALOG_TTL_SECONDS = float(os.getenv("CATALOG_TTL_SECONDS", 60))
+_catalog_cache: Dict[str, Any] = {"body": None, "expires": 0.0, "version": 0}
+
+def invalidate_catalog():
+    _catalog_cache["body"] = None
+    _catalog_cache["version"] += 1
+
 @app.get("/api/catalog")
-def get_catalog():
-    communities = [to_serializable(x) for x in get_documents("community")]
-    towers = [to_serializable(x) for x in get_documents("tower")]
-    flats = [to_serializable(x) for x in get_documents("flat")]
-    floorplans = [to_serializable(x) for x in get_documents("floorplan")]
-    return {
-        "communities": communities,
-        "towers": towers,
-        "flats": flats,
-        "floorplans": floorplans,
-    }
+async def get_catalog():
+    body = _catalog_cache["body"]
+    if body is None or time.monotonic() >= _catalog_cache["expires"]:
+        version = _catalog_cache["version"]
+        # The four reads are independent; overlap their round-trips
+        communities, towers, flats, floorplans = await asyncio.gather(
+            get_documents("community"),
+            get_documents("tower"),
+            get_documents("flat"),
+            get_documents("floorplan"),
+        )
+        catalog = {
+            "communities": [to_serializable(x) for x in communities],
+            "towers": [to_serializable(x) for x in towers],
+            "flats": [to_serializable(x) for x in flats],
+            "floorplans": [to_serializable(x) for x in floorplans],
+        }
+        # orjson handles the datetime fields natively, no jsonable_encoder pass
+        body = orjson.dumps(catalog)
+        # Don't cache a snapshot that an admin write may have raced past
+        if version == _catalog_cache["version"]:
+            _catalog_cache["body"] = body
+            _catalog_cache["expires"] = time.monotonic() + CATALOG_TTL_SECONDS
+    return Response(content=body, media_type="application/json")
 
 # ---------------------- Create content (admin) ----------------------
-# Minimal creation endpoints to seed data quickly
-@app.post("/api/communities")
-def create_community(payload: Community):
-    new_id = create_document("community", payload)
-    return {"id": new_id}
+# Minimal creation endpoints to seed data quickly. Bodies are taken as raw
+# dicts: the models only name the fields and defaults, while MongoDB's
+# COLLECTION_VALIDATORS check the values on insert. If those validators
+# could not be installed, the models validate the body instead, in strict
+# mode so both paths accept the same bodies (no "12" -> 12.0 coercion), and
+# both report failures as the same 422 RequestValidationError.
+@lru_cache(maxsize=None)
+def _float_fields(model: Type[BaseModel]) -> frozenset:
+    return frozenset(
+        name for name, field in model.model_fields.items()
+        if field.annotation is float or float in get_args(field.annotation)
+    )
 
-@app.post("/api/towers")
-def create_tower(payload: Tower):
-    new_id = create_document("tower", payload)
-    return {"id": new_id}
+def _admin_document(model: Type[BaseModel], payload: Dict[str, Any], loc: tuple = ()) -> Dict[str, Any]:
+    if not _admin_validation["server_side"]:
+        try:
+            return model.model_validate(payload, strict=True).model_dump()
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**err, "loc": ("body", *loc, *err["loc"])} for err in e.errors(include_url=False)]
+            )
+    floats = _float_fields(model)
+    doc: Dict[str, Any] = {}
+    for name, field in model.model_fields.items():
+        if name in payload:
+            value = payload[name]
+            # Store JSON integers in float fields as doubles, as model_dump would
+            if name in floats and type(value) is int:
+                value = float(value)
+            doc[name] = value
+        elif not field.is_required():
+            doc[name] = field.get_default(call_default_factory=True)
+    return doc
 
-@app.post("/api/flats")
-def create_flat(payload: Flat):
-    new_id = create_document("flat", payload)
-    return {"id": new_id}
+def _validation_errors(write_error: Dict[str, Any], loc: tuple = ()) -> List[Dict[str, Any]]:
+    """Translate a $jsonSchema errInfo into RequestValidationError entries"""
+    details = (write_error.get("errInfo") or {}).get("details") or {}
+    errors: List[Dict[str, Any]] = []
+    for rule in details.get("schemaRulesNotSatisfied", []):
+        for name in rule.get("missingProperties", []):
+            errors.append({"type": "missing", "loc": ("body", *loc, name), "msg": "Field required", "input": None})
+        for prop in rule.get("propertiesNotSatisfied", []):
+            for detail in prop.get("details") or [{}]:
+                errors.append({
+                    "type": detail.get("operatorName", "invalid"),
+                    "loc": ("body", *loc, prop.get("propertyName")),
+                    "msg": detail.get("reason", "failed validation"),
+                    "input": detail.get("consideredValue"),
+                })
+    if not errors:
+        errors.append({"type": "invalid", "loc": ("body", *loc), "msg": "Document failed validation", "input": None})
+    return errors
 
-@app.post("/api/floorplans")
-def create_floorplan(payload: FloorPlan):
-    new_id = create_document("floorplan", payload)
+def _body_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    # Raw dict bodies have no schema of their own; document the model's
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": schema}}}}
+
+async def _create_admin_document(collection_name: str, model: Type[BaseModel], payload: Dict[str, Any]):
+    try:
+        new_id = await create_document(collection_name, _admin_document(model, payload))
+    except WriteError as e:
+        raise RequestValidationError(_validation_errors(e.details or {}))
+    invalidate_catalog()
     return {"id": new_id}
 
+@app.post("/api/communities", openapi_extra=_body_schema(Community.model_json_schema()))
+async def create_community(payload: Dict[str, Any]):
+    return await _create_admin_document("community", Community, payload)
+
+@app.post("/api/towers", openapi_extra=_body_schema(Tower.model_json_schema()))
+async def create_tower(payload: Dict[str, Any]):
+    return await _create_admin_document("tower", Tower, payload)
+
+@app.post("/api/flats", openapi_extra=_body_schema(Flat.model_json_schema()))
+async def create_flat(payload: Dict[str, Any]):
+    return await _create_admin_document("flat", Flat, payload)
+
+@app.post(
+    "/api/flats/batch",
+    openapi_extra=_body_schema({"type": "array", "items": Flat.model_json_schema()}),
+)
+async def create_flats_batch(payload: List[Dict[str, Any]]):
+    docs: List[Dict[str, Any]] = []
+    errors: List[Any] = []
+    for i, item in enumerate(payload):
+        try:
+            doc = _admin_document(Flat, item, loc=(i,))
+        except RequestValidationError as e:
+            errors.extend(e.errors())
+            continue
+        # Assign ids up front so a partially failed batch can be rolled back
+        doc["_id"] = ObjectId()
+        docs.append(doc)
+    if errors:
+        raise RequestValidationError(errors)
+    try:
+        new_ids = await create_documents("flat", docs)
+    except BulkWriteError as e:
+        # ordered=False inserted the valid flats; undo them so the batch is
+        # all-or-nothing on both validation paths
+        failed = {x["index"] for x in e.details["writeErrors"]}
+        await database.db["flat"].delete_many(
+            {"_id": {"$in": [doc["_id"] for i, doc in enumerate(docs) if i not in failed]}}
+        )
+        raise RequestValidationError([
+            err for x in e.details["writeErrors"] for err in _validation_errors(x, loc=(x["index"],))
+        ])
+    invalidate_catalog()
+    return {"ids": new_ids}
+
+@app.post("/api/floorplans", openapi_extra=_body_schema(FloorPlan.model_json_schema()))
+async def create_floorplan(payload: Dict[str, Any]):
+    return await _create_admin_document("floorplan", FloorPlan, payload)
+
 # ---------------------- Leads ----------------------
 class LeadRequest(BaseModel):
     name: str
@@ -133,29 +338,35 @@ class LeadRequest(BaseModel):
     source: Optional[str] = None
 
 @app.post("/api/leads")
-def create_lead(payload: LeadRequest):
-    lead = Lead(
-        name=payload.name,
-        phone=payload.phone,
-        email=payload.email,
-        requirement_type=payload.requirement_type or "Interior",
-        source=payload.source or "web",
-        status="New",
-        assigned_manager_id=None,
-        assigned_agent_id=None,
-        follow_up_ids=[],
-    )
-    new_id = create_document("lead", lead)
+async def create_lead(payload: LeadRequest):
+    # Request body is already validated; build the Lead document as a plain
+    # dict (keys in Lead field order) instead of round-tripping a model
+    lead = {
+        "name": payload.name,
+        "phone": payload.phone,
+        "email": payload.email,
+        "assigned_agent_id": None,
+        "assigned_manager_id": None,
+        "requirement_type": payload.requirement_type or "Interior",
+        "source": payload.source or "web",
+        "status": "New",
+        "follow_up_ids": [],
+    }
+    new_id = await create_document("lead", lead)
     return {"id": new_id, "status": "New"}
 
 @app.get("/api/leads")
-def list_leads(assigned_to: Optional[str] = None):
+async def list_leads(
+    assigned_to: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    before: Optional[str] = None,
+):
     filt: Dict[str, Any] = {}
     if assigned_to:
         # return leads where assigned_agent_id == assigned_to OR assigned_manager_id == assigned_to
         filt = {"$or": [{"assigned_agent_id": assigned_to}, {"assigned_manager_id": assigned_to}]}
-    leads = db["lead"].find(filt).sort("created_at", -1)
-    return [to_serializable(x) for x in leads]
+    pipeline = _page_pipeline(filt, limit, before)
+    return await database.db["lead"].aggregate(pipeline).to_list(length=limit)
 
 class LeadUpdate(BaseModel):
     status: Optional[str] = None
@@ -163,51 +374,97 @@ class LeadUpdate(BaseModel):
     assigned_manager_id: Optional[str] = None
 
 @app.patch("/api/leads/{lead_id}")
-def update_lead(lead_id: str, payload: LeadUpdate):
-    if not ObjectId.is_valid(lead_id):
-        raise HTTPException(status_code=400, detail="Invalid lead id")
-    update_doc = {k: v for k, v in payload.model_dump(exclude_none=True).items()}
+async def update_lead(lead_id: str, payload: LeadUpdate):
+    lead_oid = _to_oid(lead_id, "lead")
+    update_doc = payload.model_dump(exclude_none=True)
     if not update_doc:
         return {"updated": False}
-    res = db["lead"].update_one({"_id": ObjectId(lead_id)}, {"$set": update_doc})
-    if res.matched_count == 0:
+    # Return the updated lead so callers don't need a follow-up read
+    lead = await database.db["lead"].find_one_and_update(
+        {"_id": lead_oid},
+        {"$set": update_doc},
+        return_document=ReturnDocument.AFTER,
+    )
+    if lead is None:
         raise HTTPException(status_code=404, detail="Lead not found")
-    return {"updated": True}
+    return {"updated": True, "lead": to_serializable(lead)}
 
 # ---------------------- Follow-ups ----------------------
 @app.post("/api/followups")
-def create_followup(payload: FollowUp):
-    # ensure lead exists
-    if not ObjectId.is_valid(payload.lead_id):
-        raise HTTPException(status_code=400, detail="Invalid lead id")
-    exists = db["lead"].find_one({"_id": ObjectId(payload.lead_id)})
-    if not exists:
+async def create_followup(payload: FollowUp):
+    lead_oid = _to_oid(payload.lead_id, "lead")
+    # Generate the follow-up id up front so the $push onto lead.follow_up_ids
+    # can run concurrently with the insert; the push doubles as the lead
+    # existence check. When one half fails the other is undone best-effort:
+    # - a well-formed but unknown lead_id costs an insert plus a delete, and
+    #   the orphan is briefly visible in GET /api/followups/{lead_id};
+    # - if the process dies or the compensating write fails, the orphan (or
+    #   the dangling id) stays. A failed compensation is logged and the
+    #   original error is still raised.
+    followup_id = ObjectId()
+    followup = payload.model_dump()
+    followup["_id"] = followup_id
+    pushed, new_id = await asyncio.gather(
+        database.db["lead"].update_one(
+            {"_id": lead_oid},
+            {"$push": {"follow_up_ids": str(followup_id)}},
+        ),
+        create_document("followup", followup),
+        return_exceptions=True,
+    )
+    if isinstance(new_id, BaseException):
+        if not isinstance(pushed, BaseException):
+            try:
+                await database.db["lead"].update_one(
+                    {"_id": lead_oid},
+                    {"$pull": {"follow_up_ids": str(followup_id)}},
+                )
+            except Exception as e:
+                logger.error("Could not pull follow-up %s from lead %s: %s", followup_id, lead_oid, e)
+        raise new_id
+    if isinstance(pushed, BaseException) or pushed.matched_count == 0:
+        try:
+            await database.db["followup"].delete_one({"_id": followup_id})
+        except Exception as e:
+            logger.error("Could not delete orphaned follow-up %s: %s", followup_id, e)
+        if isinstance(pushed, BaseException):
+            raise pushed
         raise HTTPException(status_code=404, detail="Lead not found")
-    new_id = create_document("followup", payload)
-    # push to lead.follow_up_ids
-    db["lead"].update_one({"_id": ObjectId(payload.lead_id)}, {"$push": {"follow_up_ids": new_id}})
     return {"id": new_id}
 
 @app.get("/api/followups/{lead_id}")
-def list_followups(lead_id: str):
-    if not ObjectId.is_valid(lead_id):
-        raise HTTPException(status_code=400, detail="Invalid lead id")
-    items = db["followup"].find({"lead_id": lead_id}).sort("created_at", -1)
-    return [to_serializable(x) for x in items]
+async def list_followups(
+    lead_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    before: Optional[str] = None,
+):
+    _to_oid(lead_id, "lead")
+    pipeline = _page_pipeline({"lead_id": lead_id}, limit, before)
+    return await database.db["followup"].aggregate(pipeline).to_list(length=limit)
 
 # ---------------------- Quotations ----------------------
-@app.post("/api/quotations/compute")
-def compute_quote(inputs: QuotationInputs):
-    subtotal = inputs.area * inputs.rate_per_sqft + inputs.material_cost
-    gst = subtotal * (inputs.gst_percent / 100.0)
+def _quote_math(
+    area: float, rate: float, material: float, gst_pct: float, markup_pct: float,
+) -> Tuple[float, float, float, float]:
+    """Unrounded (subtotal, gst, markup, total); takes plain floats so the
+    arithmetic doesn't go through model attribute access"""
+    subtotal = area * rate + material
+    gst = subtotal * (gst_pct / 100.0)
     total_with_gst = subtotal + gst
-    markup = total_with_gst * (inputs.markup_percent / 100.0)
-    grand_total = round(total_with_gst + markup, 2)
+    markup = total_with_gst * (markup_pct / 100.0)
+    return subtotal, gst, markup, total_with_gst + markup
+
+@app.post("/api/quotations/compute")
+async def compute_quote(inputs: QuotationInputs):
+    subtotal, gst, markup, total = _quote_math(
+        inputs.area, inputs.rate_per_sqft, inputs.material_cost,
+        inputs.gst_percent, inputs.markup_percent,
+    )
     return {
         "subtotal": round(subtotal, 2),
         "gst": round(gst, 2),
         "markup": round(markup, 2),
-        "total": grand_total,
+        "total": round(total, 2),
     }
 
 class QuotationCreate(BaseModel):
@@ -217,30 +474,38 @@ class QuotationCreate(BaseModel):
     created_by: Optional[str] = None
 
 @app.post("/api/quotations")
-def create_quote(payload: QuotationCreate):
-    if not ObjectId.is_valid(payload.lead_id):
-        raise HTTPException(status_code=400, detail="Invalid lead id")
-    res = compute_quote(payload.inputs)
-    quotation = Quotation(
-        lead_id=payload.lead_id,
-        project_id=payload.project_id,
-        pricing_inputs=payload.inputs,
-        generated_price=res["total"],
-        created_by=payload.created_by,
-        pdf_url=None,
-    )
-    new_id = create_document("quotation", quotation)
-    return {"id": new_id, "total": res["total"]}
+async def create_quote(payload: QuotationCreate):
+    _to_oid(payload.lead_id, "lead")
+    inputs = payload.inputs
+    total = round(_quote_math(
+        inputs.area, inputs.rate_per_sqft, inputs.material_cost,
+        inputs.gst_percent, inputs.markup_percent,
+    )[3], 2)
+    quotation = {
+        "lead_id": payload.lead_id,
+        "project_id": payload.project_id,
+        "pricing_inputs": inputs.model_dump(),
+        "generated_price": total,
+        "pdf_url": None,
+        "created_by": payload.created_by,
+    }
+    new_id = await create_document("quotation", quotation)
+    return {"id": new_id, "total": total}
 
 @app.get("/api/quotations/by-lead/{lead_id}")
-def quotes_by_lead(lead_id: str):
-    if not ObjectId.is_valid(lead_id):
-        raise HTTPException(status_code=400, detail="Invalid lead id")
-    items = db["quotation"].find({"lead_id": lead_id}).sort("created_at", -1)
-    return [to_serializable(x) for x in items]
+async def quotes_by_lead(
+    lead_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    before: Optional[str] = None,
+):
+    _to_oid(lead_id, "lead")
+    pipeline = _page_pipeline({"lead_id": lead_id}, limit, before)
+    return await database.db["quotation"].aggregate(pipeline).to_list(length=limit)
 
 
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    workers = int(os.getenv("WEB_CONCURRENCY", 1))
+    # Multiple workers need the app as an import string
+    uvicorn.run("main:app", host="0.0.0.0", port=port, loop="uvloop", http="httptools", workers=workers)
@@ -6,7 +6,7 @@ name is the lowercase of the class name (e.g., Community -> "community").
 These schemas are used for validation in the API layer.
 """
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 
 # Core domain schemas
 class Community(BaseModel):
@@ -26,7 +26,7 @@ class Flat(BaseModel):
     number: str
     tower_id: str
     bhk_type: str
-    status: str = Field("available", pattern=r"^(available|booked|sold)$")
+    status: Literal["available", "booked", "sold"] = "available"
     images: List[str] = []
 
 class FloorPlan(BaseModel):
@@ -40,7 +40,7 @@ class FollowUp(BaseModel):
     lead_id: str
     notes: str
     next_date: Optional[str] = Field(None, description="ISO date string")
-    type: str = Field("call", pattern=r"^(call|visit|whatsapp)$")
+    type: Literal["call", "visit", "whatsapp"] = "call"
     agent_id: Optional[str] = None
 
 class Lead(BaseModel):
@@ -70,12 +70,67 @@ class Quotation(BaseModel):
     created_by: Optional[str] = None  # agent/manager id
 
 class User(BaseModel):
-    role: str = Field(..., pattern=r"^(customer|agent|manager|admin)$")
+    role: Literal["customer", "agent", "manager", "admin"]
     name: str
     email: Optional[str] = None
     phone: Optional[str] = None
     avatar_url: Optional[str] = None
 
+# MongoDB-side validators for the catalog collections. The admin endpoints
+# pass request bodies straight through, so these mirror Community, Tower,
+# Flat and FloorPlan above and are enforced by the server on insert. They
+# are written by hand: keep them in sync whenever one of those models
+# changes. They are strict (a string is never accepted for a number).
+_STRING_LIST = {"bsonType": "array", "items": {"bsonType": "string"}}
+_OPTIONAL_STRING = {"bsonType": ["string", "null"]}
+_OPTIONAL_NON_NEGATIVE = {"bsonType": ["number", "null"], "minimum": 0}
+
+COLLECTION_VALIDATORS: Dict[str, Dict[str, Any]] = {
+    "community": {"$jsonSchema": {
+        "bsonType": "object",
+        "required": ["name", "city"],
+        "properties": {
+            "name": {"bsonType": "string"},
+            "city": {"bsonType": "string"},
+            "starting_price": _OPTIONAL_NON_NEGATIVE,
+            "image_url": _OPTIONAL_STRING,
+            "amenities_images": _STRING_LIST,
+        },
+    }},
+    "tower": {"$jsonSchema": {
+        "bsonType": "object",
+        "required": ["name", "community_id"],
+        "properties": {
+            "name": {"bsonType": "string"},
+            "community_id": {"bsonType": "string"},
+            "images": _STRING_LIST,
+            "pdfs": _STRING_LIST,
+        },
+    }},
+    "flat": {"$jsonSchema": {
+        "bsonType": "object",
+        "required": ["number", "tower_id", "bhk_type"],
+        "properties": {
+            "number": {"bsonType": "string"},
+            "tower_id": {"bsonType": "string"},
+            "bhk_type": {"bsonType": "string"},
+            "status": {"enum": ["available", "booked", "sold"]},
+            "images": _STRING_LIST,
+        },
+    }},
+    "floorplan": {"$jsonSchema": {
+        "bsonType": "object",
+        "required": ["bhk_type"],
+        "properties": {
+            "bhk_type": {"bsonType": "string"},
+            "image_url": _OPTIONAL_STRING,
+            "pdf_url": _OPTIONAL_STRING,
+            "carpet_area": _OPTIONAL_NON_NEGATIVE,
+            "uds_area": _OPTIONAL_NON_NEGATIVE,
+        },
+    }},
+}
+
 # Utility: minimal schema manifest (used optionally by any viewer)
 class SchemaManifest(BaseModel):
     collections: List[str]